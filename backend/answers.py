@@ -0,0 +1,108 @@
+"""
+Answer validation: signed player tokens and an in-memory ledger of who has
+answered the current question of each room, so duplicates and retries are
+settled without touching the database.
+"""
+import os
+import secrets
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Set
+
+from jose import JWTError, jwt
+
+# Must be shared by every worker (and survive restarts) for tokens to stay valid
+# across replicas and room migrations
+PLAYER_TOKEN_SECRET = os.getenv("PLAYER_TOKEN_SECRET")
+PLAYER_TOKEN_TTL = int(os.getenv("PLAYER_TOKEN_TTL", str(12 * 3600)))  # seconds
+PLAYER_TOKEN_ALGORITHM = "HS256"
+
+if not PLAYER_TOKEN_SECRET:
+    if os.getenv("PYTHON_ENV") != "development":
+        raise RuntimeError("PLAYER_TOKEN_SECRET must be set (or PYTHON_ENV=development for a throwaway secret)")
+    PLAYER_TOKEN_SECRET = secrets.token_urlsafe(32)
+    print("WARNING: PLAYER_TOKEN_SECRET not set, player tokens are only valid on this worker")
+
+def create_player_token(user_id: int, room_id: str) -> str:
+    payload = {
+        "sub": str(user_id),
+        "room_id": room_id,
+        "exp": datetime.utcnow() + timedelta(seconds=PLAYER_TOKEN_TTL)
+    }
+    return jwt.encode(payload, PLAYER_TOKEN_SECRET, algorithm=PLAYER_TOKEN_ALGORITHM)
+
+def verify_player_token(token: str) -> Optional[Dict]:
+    """Return {"user_id", "room_id"} for a valid token, None otherwise"""
+    try:
+        payload = jwt.decode(token, PLAYER_TOKEN_SECRET, algorithms=[PLAYER_TOKEN_ALGORITHM])
+        return {"user_id": int(payload["sub"]), "room_id": payload["room_id"]}
+    except (JWTError, KeyError, ValueError):
+        return None
+
+class QuestionAnswers:
+    def __init__(self, question_id: Optional[int]):
+        self.question_id = question_id
+        self.user_ids: Set[int] = set()
+        self.responses: Dict[str, Dict] = {}  # "user_id:idempotency key" -> response already returned
+
+class AnswerLedger:
+    """Per room: the users who answered the current question and their responses"""
+
+    def __init__(self):
+        self.rooms: Dict[str, QuestionAnswers] = {}
+
+    def start_question(self, room_id: str, question_id: Optional[int]):
+        self.rooms[room_id] = QuestionAnswers(question_id)
+
+    def _current(self, room_id: str, question_id: int) -> QuestionAnswers:
+        answers = self.rooms.get(room_id)
+        if answers is None or answers.question_id != question_id:
+            answers = self.rooms[room_id] = QuestionAnswers(question_id)
+        return answers
+
+    @staticmethod
+    def _response_key(user_id: int, idempotency_key: str) -> str:
+        # Scoped to the user, so a guessed key never returns someone else's result
+        return f"{user_id}:{idempotency_key}"
+
+    def replay(self, room_id: str, question_id: int, user_id: int, idempotency_key: Optional[str]) -> Optional[Dict]:
+        """The response already given to this user for this idempotency key, if any"""
+        if not idempotency_key:
+            return None
+        return self._current(room_id, question_id).responses.get(self._response_key(user_id, idempotency_key))
+
+    def claim(self, room_id: str, question_id: int, user_id: int) -> bool:
+        """Record that the user answered; False if they already had"""
+        answers = self._current(room_id, question_id)
+        if user_id in answers.user_ids:
+            return False
+        answers.user_ids.add(user_id)
+        return True
+
+    def release(self, room_id: str, question_id: int, user_id: int):
+        """Undo a claim when the answer could not be stored"""
+        self._current(room_id, question_id).user_ids.discard(user_id)
+
+    def remember(self, room_id: str, question_id: int, user_id: int, idempotency_key: Optional[str], response: Dict):
+        if idempotency_key:
+            self._current(room_id, question_id).responses[self._response_key(user_id, idempotency_key)] = response
+
+    def snapshot(self, room_id: str) -> Optional[Dict]:
+        answers = self.rooms.get(room_id)
+        if answers is None:
+            return None
+        return {
+            "question_id": answers.question_id,
+            "user_ids": sorted(answers.user_ids),
+            "responses": answers.responses
+        }
+
+    def restore(self, room_id: str, snapshot: Optional[Dict]):
+        if not snapshot:
+            return
+        answers = QuestionAnswers(snapshot.get("question_id"))
+        answers.user_ids = set(snapshot.get("user_ids", []))
+        answers.responses = dict(snapshot.get("responses", {}))
+        self.rooms[room_id] = answers
+
+    def clear(self, room_id: str):
+        self.rooms.pop(room_id, None)
@@ -0,0 +1,113 @@
+"""
+Database engine, session factory and models. Kept apart from main.py so
+init_db.py and other scripts can use the database without loading the app.
+"""
+import os
+from datetime import datetime
+
+from sqlalchemy import create_engine, Column, Integer, String, Boolean, DateTime, Text, inspect, text
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import sessionmaker
+
+# Database setup
+# Use environment variable or default to data directory
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/jeopardy.db")
+
+# The engine is created by init_database() (from the app lifespan or init_db.py),
+# so importing this module stays cheap
+engine = None
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+Base = declarative_base()
+
+# Database Models
+class User(Base):
+    __tablename__ = "users"
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, index=True)
+    score = Column(Integer, default=0)
+    is_host = Column(Boolean, default=False)
+    room_id = Column(String, index=True)  # Add room_id to separate players by room
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class Question(Base):
+    __tablename__ = "questions"
+    id = Column(Integer, primary_key=True, index=True)
+    question_text = Column(Text)
+    option_a = Column(String)
+    option_b = Column(String)
+    option_c = Column(String)
+    option_d = Column(String)
+    correct_answer = Column(String)
+    is_active = Column(Boolean, default=False)
+    room_id = Column(String, index=True)  # Add room_id to track active questions per room
+    source_key = Column(String, unique=True, index=True)  # hash of the text for questions managed by questions.txt
+    content_hash = Column(String)  # hash of all fields, detects edits in questions.txt
+    is_deleted = Column(Boolean, default=False)  # soft delete: removed from questions.txt
+
+class UserAnswer(Base):
+    __tablename__ = "user_answers"
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer)
+    question_id = Column(Integer)
+    selected_answer = Column(String)
+    is_correct = Column(Boolean)
+    room_id = Column(String, index=True)  # Add room_id to track answers per room
+    response_time_ms = Column(Integer)  # measured on the server from the question broadcast
+    answered_at = Column(DateTime, default=datetime.utcnow)
+
+class RoomUsedQuestion(Base):
+    __tablename__ = "room_used_questions"
+    id = Column(Integer, primary_key=True, index=True)
+    room_id = Column(String, index=True)
+    question_id = Column(Integer, index=True)
+
+class RoomCheckpoint(Base):
+    __tablename__ = "room_checkpoints"
+    room_id = Column(String, primary_key=True)
+    state = Column(Text)  # JSON-encoded game_state, written when a worker drains
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+# Columns introduced after the first release: table -> [(column, DDL statements)]
+ADDED_COLUMNS = {
+    "questions": [
+        ("source_key", [
+            "ALTER TABLE questions ADD COLUMN source_key VARCHAR",
+            "CREATE UNIQUE INDEX IF NOT EXISTS ix_questions_source_key ON questions (source_key)"
+        ]),
+        ("content_hash", ["ALTER TABLE questions ADD COLUMN content_hash VARCHAR"]),
+        ("is_deleted", ["ALTER TABLE questions ADD COLUMN is_deleted BOOLEAN NOT NULL DEFAULT 0"])
+    ],
+    "user_answers": [
+        ("response_time_ms", ["ALTER TABLE user_answers ADD COLUMN response_time_ms INTEGER"])
+    ]
+}
+
+# Add those columns to existing databases
+def ensure_added_columns():
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table, columns in ADDED_COLUMNS.items():
+            existing = {col["name"] for col in inspector.get_columns(table)}
+            for column, statements in columns:
+                if column not in existing:
+                    for statement in statements:
+                        conn.execute(text(statement))
+
+def init_database():
+    global engine
+    if engine is not None:
+        return engine
+
+    # Ensure data directory exists
+    if DATABASE_URL.startswith("sqlite:///"):
+        db_dir = os.path.dirname(DATABASE_URL[len("sqlite:///"):])
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+    SessionLocal.configure(bind=engine)
+
+    # Create tables
+    Base.metadata.create_all(bind=engine)
+    ensure_added_columns()
+    return engine
@@ -1,22 +1,8 @@
 """
-Script to initialize the database with sample questions if empty
+Script to initialize the database with sample questions if empty.
+The backend also runs seed_sample_questions() from its startup lifespan.
 """
-import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from main import Base, Question
-
-# Database setup
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/jeopardy.db")
-
-# Ensure data directory exists
-os.makedirs("./data", exist_ok=True)
-
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-# Create tables
-Base.metadata.create_all(bind=engine)
+from database import SessionLocal, Question, init_database
 
 # Sample questions
 sample_questions = [
@@ -62,35 +48,40 @@ sample_questions = [
     }
 ]
 
-# Initialize database
-db = SessionLocal()
-try:
-    # Check if there are already questions
-    count = db.query(Question).count()
+def seed_sample_questions():
+    # Database setup (creates the data directory and tables)
+    init_database()
+
+    db = SessionLocal()
+    try:
+        # Check if there are already questions
+        count = db.query(Question).count()
     
-    if count == 0:
-        print("Database is empty. Adding sample questions...")
-        for q_data in sample_questions:
-            question = Question(
-                question_text=q_data["question_text"],
-                option_a=q_data["option_a"],
-                option_b=q_data["option_b"],
-                option_c=q_data["option_c"],
-                option_d=q_data["option_d"],
-                correct_answer=q_data["correct_answer"],
-                is_active=False,
-                room_id=None  # Global questions, not tied to any specific room
-            )
-            db.add(question)
-        db.commit()
-        print(f"Added {len(sample_questions)} sample questions to the database.")
-    else:
-        print(f"Database already contains {count} questions. No initialization needed.")
-except Exception as e:
-    print(f"Error initializing database: {e}")
-    db.rollback()
-finally:
-    db.close()
+        if count == 0:
+            print("Database is empty. Adding sample questions...")
+            for q_data in sample_questions:
+                question = Question(
+                    question_text=q_data["question_text"],
+                    option_a=q_data["option_a"],
+                    option_b=q_data["option_b"],
+                    option_c=q_data["option_c"],
+                    option_d=q_data["option_d"],
+                    correct_answer=q_data["correct_answer"],
+                    is_active=False,
+                    room_id=None  # Global questions, not tied to any specific room
+                )
+                db.add(question)
+            db.commit()
+            print(f"Added {len(sample_questions)} sample questions to the database.")
+        else:
+            print(f"Database already contains {count} questions. No initialization needed.")
+    except Exception as e:
+        print(f"Error initializing database: {e}")
+        db.rollback()
+    finally:
+        db.close()
 
-print("Database initialization complete!")
+    print("Database initialization complete!")
 
+if __name__ == "__main__":
+    seed_sample_questions()
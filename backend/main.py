@@ -1,67 +1,22 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Depends
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Depends, Header
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import create_engine, Column, Integer, String, Boolean, DateTime, Text
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy import delete, update
+from sqlalchemy.orm import Session
 from pydantic import BaseModel
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional, Tuple
 import json
 import asyncio
 from datetime import datetime
 import os
 import random
-
-# Database setup
-# Use environment variable or default to data directory
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/jeopardy.db")
-
-# Ensure data directory exists
-os.makedirs("./data", exist_ok=True)
-
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
-
-# Database Models
-class User(Base):
-    __tablename__ = "users"
-    id = Column(Integer, primary_key=True, index=True)
-    name = Column(String, index=True)
-    score = Column(Integer, default=0)
-    is_host = Column(Boolean, default=False)
-    room_id = Column(String, index=True)  # Add room_id to separate players by room
-    created_at = Column(DateTime, default=datetime.utcnow)
-
-class Question(Base):
-    __tablename__ = "questions"
-    id = Column(Integer, primary_key=True, index=True)
-    question_text = Column(Text)
-    option_a = Column(String)
-    option_b = Column(String)
-    option_c = Column(String)
-    option_d = Column(String)
-    correct_answer = Column(String)
-    is_active = Column(Boolean, default=False)
-    room_id = Column(String, index=True)  # Add room_id to track active questions per room
-
-class UserAnswer(Base):
-    __tablename__ = "user_answers"
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer)
-    question_id = Column(Integer)
-    selected_answer = Column(String)
-    is_correct = Column(Boolean)
-    room_id = Column(String, index=True)  # Add room_id to track answers per room
-    answered_at = Column(DateTime, default=datetime.utcnow)
-
-class RoomUsedQuestion(Base):
-    __tablename__ = "room_used_questions"
-    id = Column(Integer, primary_key=True, index=True)
-    room_id = Column(String, index=True)
-    question_id = Column(Integer, index=True)
-
-# Create tables
-Base.metadata.create_all(bind=engine)
+import signal
+import time
+from contextlib import asynccontextmanager
+import database
+from database import SessionLocal, User, Question, UserAnswer, RoomUsedQuestion, RoomCheckpoint
+from answers import AnswerLedger, create_player_token, verify_player_token
+from question_sync import QuestionDiff, QuestionFileWatcher, compute_diff, parse_questions, question_key
+from spectators import SpectatorFeed, SpectatorHub
 
 # Pydantic models
 class UserCreate(BaseModel):
@@ -76,6 +31,9 @@ class UserResponse(BaseModel):
     is_host: bool
     room_id: str
 
+class RegisterResponse(UserResponse):
+    token: str  # signed player token, required to submit answers
+
 class QuestionResponse(BaseModel):
     id: int
     question_text: str
@@ -85,13 +43,39 @@ class QuestionResponse(BaseModel):
     option_d: str
 
 class AnswerSubmit(BaseModel):
-    user_id: int
+    user_id: Optional[int] = None  # optional, the player token decides who is answering
     question_id: int
     selected_answer: str
     room_id: str
+    idempotency_key: Optional[str] = None  # retries with the same key get the original response
+
+# Readiness flags, reported by /ready ("serving" goes False while draining)
+readiness: Dict[str, bool] = {"database": False, "caches": False, "serving": True}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Schema creation and first-run seeding, imported here so only the server pays for it
+    from init_db import seed_sample_questions
+    await asyncio.to_thread(seed_sample_questions)
+    readiness["database"] = True
+    install_drain_handler()
+
+    # Warm every in-memory cache concurrently
+    await asyncio.gather(*(asyncio.to_thread(warmer) for warmer in cache_warmers))
+    # A broken questions file is logged and retried by the watcher, it never blocks startup
+    await questions_watcher.safe_check()
+    questions_watcher.start()
+    spectator_feed.start()
+    readiness["caches"] = True
+
+    yield
+
+    readiness["caches"] = False
+    await spectator_feed.stop()
+    await questions_watcher.stop()
 
 # FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # CORS middleware
 app.add_middleware(
@@ -108,6 +92,7 @@ class ConnectionManager:
         self.active_connections: Dict[str, List[WebSocket]] = {}  # room_id -> connections
         self.host_connections: Dict[str, WebSocket] = {}  # room_id -> host_connection
         self.connection_rooms: Dict[WebSocket, str] = {}  # websocket -> room_id
+        self.connection_users: Dict[WebSocket, int] = {}  # websocket -> user_id bound by player token
 
     async def connect(self, websocket: WebSocket, room_id: str = "default"):
         await websocket.accept()
@@ -124,11 +109,15 @@ class ConnectionManager:
             if room_id in self.host_connections and websocket == self.host_connections[room_id]:
                 del self.host_connections[room_id]
             del self.connection_rooms[websocket]
+        self.connection_users.pop(websocket, None)
 
     async def send_personal_message(self, message: str, websocket: WebSocket):
         await websocket.send_text(message)
 
     async def broadcast(self, message: str, room_id: str = "default"):
+        # Spectators get a coalesced snapshot instead of every event, even when
+        # no players are connected to this worker
+        spectator_feed.mark_dirty(room_id)
         if room_id not in self.active_connections:
             print(f"WARNING: No connections found for room {room_id}. Available rooms: {list(self.active_connections.keys())}")
             return
@@ -150,11 +139,21 @@ class ConnectionManager:
             except:
                 pass
 
+    async def close_all(self, code: int = 1000):
+        for connection in list(self.connection_rooms):
+            try:
+                await connection.close(code=code)
+            except Exception:
+                pass
+            self.disconnect(connection)
+
 manager = ConnectionManager()
 
 # Game state per room
 game_states: Dict[str, Dict] = {}  # room_id -> game_state
 
+ROOM_CHECKPOINT_TTL = int(os.getenv("ROOM_CHECKPOINT_TTL", "3600"))  # seconds a checkpoint can be restored
+
 def get_game_state(room_id: str) -> Dict:
     if room_id not in game_states:
         game_states[room_id] = {
@@ -164,43 +163,96 @@ def get_game_state(room_id: str) -> Dict:
             "current_question": None,
             "time_remaining": 0,
             "question_timer": 0,
+            "question_started_at": None,  # epoch seconds when the current question was broadcast
             "asked_ids": []  # track asked question ids per room for this game session
         }
+        # Resume a room handed over by a draining worker
+        restored = load_room_checkpoint(room_id)
+        if restored:
+            answer_ledger.restore(room_id, restored.pop("answers", None))
+            game_states[room_id].update(restored)
+            print(f"Restored game state for room {room_id} from checkpoint")
     return game_states[room_id]
 
+# Who answered the current question of each room (dedupe and idempotency)
+answer_ledger = AnswerLedger()
+
+# Room checkpoints
+def load_room_checkpoint(room_id: str) -> Optional[Dict]:
+    """Take (read and delete) the checkpoint of a room, so it is restored only once"""
+    if database.engine is None:
+        return None
+    db = SessionLocal()
+    try:
+        row = db.execute(
+            delete(RoomCheckpoint).where(RoomCheckpoint.room_id == room_id).returning(
+                RoomCheckpoint.state, RoomCheckpoint.updated_at
+            )
+        ).first()
+        db.commit()
+        if not row or (datetime.utcnow() - row.updated_at).total_seconds() > ROOM_CHECKPOINT_TTL:
+            return None
+        return json.loads(row.state)
+    except Exception as e:
+        db.rollback()
+        print(f"Error loading checkpoint for room {room_id}: {e}")
+        return None
+    finally:
+        db.close()
+
+def save_room_checkpoints(states: Dict[str, str]):
+    """Upsert the JSON-encoded game state of every room"""
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        for room_id, state in states.items():
+            db.merge(RoomCheckpoint(room_id=room_id, state=state, updated_at=now))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
 # Load questions from file
+QUESTIONS_FILE = os.getenv("QUESTIONS_FILE", "questions.txt")
+QUESTIONS_POLL_INTERVAL = float(os.getenv("QUESTIONS_POLL_INTERVAL", "5"))
+
 def load_questions():
-    questions = []
     try:
-        with open("questions.txt", "r", encoding="utf-8") as f:
-            content = f.read()
-            question_blocks = content.split("\n\n")
-            
-            for block in question_blocks:
-                if not block.strip():
-                    continue
-                    
-                lines = block.strip().split("\n")
-                if len(lines) >= 6:
-                    question_text = lines[0]
-                    option_a = lines[1].replace("A) ", "")
-                    option_b = lines[2].replace("B) ", "")
-                    option_c = lines[3].replace("C) ", "")
-                    option_d = lines[4].replace("D) ", "")
-                    correct_answer = lines[5].replace("correcta:", "")
-                    
-                    questions.append({
-                        "question_text": question_text,
-                        "option_a": option_a,
-                        "option_b": option_b,
-                        "option_c": option_c,
-                        "option_d": option_d,
-                        "correct_answer": correct_answer
-                    })
+        with open(QUESTIONS_FILE, "r", encoding="utf-8") as f:
+            return parse_questions(f.read())
     except Exception as e:
         print(f"Error loading questions: {e}")
-    
-    return questions
+        return []
+
+# In-memory question bank: question_id -> question data for live (not deleted) questions
+question_cache: Dict[int, Dict] = {}
+
+def cache_question(question: Question):
+    question_cache[question.id] = {
+        "id": question.id,
+        "question_text": question.question_text,
+        "option_a": question.option_a,
+        "option_b": question.option_b,
+        "option_c": question.option_c,
+        "option_d": question.option_d,
+        "correct_answer": question.correct_answer
+    }
+
+def warm_question_cache():
+    db = SessionLocal()
+    try:
+        questions = db.query(Question).filter(Question.is_deleted == False).all()
+    finally:
+        db.close()
+    question_cache.clear()
+    for question in questions:
+        cache_question(question)
+    print(f"Question cache warmed with {len(question_cache)} questions")
+
+# Run at startup (concurrently, each in a worker thread) before the pod reports ready
+cache_warmers: List[Callable[[], None]] = [warm_question_cache]
 
 # Database functions
 def get_db():
@@ -254,13 +306,14 @@ def set_question_inactive(db: Session, room_id: str = None):
     print(f"Updated {result} questions to inactive")
     db.commit()
 
-def save_user_answer(db: Session, user_id: int, question_id: int, selected_answer: str, is_correct: bool, room_id: str):
+def save_user_answer(db: Session, user_id: int, question_id: int, selected_answer: str, is_correct: bool, room_id: str, response_time_ms: Optional[int] = None):
     answer = UserAnswer(
         user_id=user_id,
         question_id=question_id,
         selected_answer=selected_answer,
         is_correct=is_correct,
-        room_id=room_id
+        room_id=room_id,
+        response_time_ms=response_time_ms
     )
     db.add(answer)
     db.commit()
@@ -269,24 +322,204 @@ def save_user_answer(db: Session, user_id: int, question_id: int, selected_answe
 def get_user_answers(db: Session, user_id: int):
     return db.query(UserAnswer).filter(UserAnswer.user_id == user_id).all()
 
+def apply_question_file(db: Session, file_questions: List[Dict]) -> Tuple[QuestionDiff, List[Question]]:
+    """Apply only the inserts, updates and soft deletes needed to match questions.txt"""
+    # Adopt questions that already exist with the same text (e.g. seeded by init_db.py)
+    # so they are tracked instead of duplicated
+    file_keys = {question_key(q["question_text"]) for q in file_questions}
+    # Keys already owned by a tracked row are not up for adoption (source_key is unique)
+    file_keys -= {key for (key,) in db.query(Question.source_key).filter(Question.source_key != None).all()}
+    for question in db.query(Question).filter(Question.source_key == None).all():
+        key = question_key(question.question_text or "")
+        if key in file_keys:
+            question.source_key = key
+            file_keys.discard(key)
+    db.flush()
+
+    existing = {
+        key: (qid, chash, bool(deleted))
+        for (qid, key, chash, deleted) in db.query(
+            Question.id, Question.source_key, Question.content_hash, Question.is_deleted
+        ).filter(Question.source_key != None).all()
+    }
+    diff = compute_diff(file_questions, existing)
+
+    changed = []
+    for row in diff.inserts:
+        question = Question(**row, is_active=False, is_deleted=False, room_id=None)
+        db.add(question)
+        changed.append(question)
+    for question_id, row in diff.updates:
+        question = db.query(Question).filter(Question.id == question_id).first()
+        for name, value in row.items():
+            setattr(question, name, value)
+        question.is_deleted = False
+        changed.append(question)
+    if diff.deletes:
+        db.query(Question).filter(Question.id.in_(diff.deletes)).update(
+            {"is_deleted": True}, synchronize_session=False
+        )
+    db.commit()
+    for question in changed:
+        db.refresh(question)
+    return diff, changed
+
+async def sync_questions_file(file_questions: List[Dict]):
+    def run():
+        db = SessionLocal()
+        try:
+            return apply_question_file(db, file_questions)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    diff, changed = await asyncio.to_thread(run)
+    # Apply the same diff to the in-memory bank
+    for question in changed:
+        cache_question(question)
+    for question_id in diff.deletes:
+        question_cache.pop(question_id, None)
+    print(f"Questions file synced: {diff.summary()}")
+
+questions_watcher = QuestionFileWatcher(QUESTIONS_FILE, sync_questions_file, QUESTIONS_POLL_INTERVAL)
+
+# Graceful drain
+DRAIN_RECONNECT_DELAY_MS = int(os.getenv("DRAIN_RECONNECT_DELAY_MS", "1000"))
+
+def ensure_serving():
+    if not readiness["serving"]:
+        raise HTTPException(status_code=503, detail="Server is draining, retry shortly")
+
+async def drain():
+    """Stop taking new rooms, checkpoint every room and ask clients to reconnect elsewhere"""
+    if not readiness["serving"]:
+        return
+    readiness["serving"] = False
+    print(f"Draining {len(game_states)} rooms")
+
+    states = {
+        room_id: json.dumps({**state, "answers": answer_ledger.snapshot(room_id)})
+        for room_id, state in game_states.items()
+    }
+    if states:
+        await asyncio.to_thread(save_room_checkpoints, states)
+
+    message = json.dumps({
+        "type": "server_draining",
+        "message": "Server is restarting, reconnecting...",
+        "retry_after_ms": DRAIN_RECONNECT_DELAY_MS
+    })
+    for room_id in list(manager.active_connections):
+        await manager.broadcast(message, room_id)
+    # 1012 = service restart, clients reconnect through the load balancer
+    await manager.close_all(code=1012)
+    await spectator_hub.close_all(code=1012)
+
+drain_task: Optional[asyncio.Task] = None
+
+async def drain_and_exit():
+    try:
+        await drain()
+    except Exception as e:
+        print(f"Error draining: {e}")
+    # Hand over to uvicorn's own graceful shutdown, once the drain is done
+    signal.raise_signal(signal.SIGINT)
+
+def handle_sigterm():
+    # Repeated SIGTERMs must not start a second drain or exit before the first one ends
+    global drain_task
+    if drain_task is None:
+        drain_task = asyncio.ensure_future(drain_and_exit())
+
+def install_drain_handler():
+    """Run the drain on SIGTERM (overrides uvicorn's handler, which is restored via SIGINT)"""
+    loop = asyncio.get_running_loop()
+    try:
+        loop.add_signal_handler(signal.SIGTERM, handle_sigterm)
+    except (NotImplementedError, RuntimeError, ValueError):
+        # Not on the main thread (e.g. test client) or not supported by the platform
+        print("SIGTERM drain handler not installed")
+
+# Spectator feed: read-only, throttled snapshots shared by every viewer of a room
+SPECTATOR_FRAME_INTERVAL = float(os.getenv("SPECTATOR_FRAME_INTERVAL", "0.5"))
+SPECTATOR_LEADERBOARD_SIZE = int(os.getenv("SPECTATOR_LEADERBOARD_SIZE", "50"))
+
+def get_leaderboard(room_id: str, limit: int) -> List[Dict]:
+    db = SessionLocal()
+    try:
+        users = db.query(User).filter(User.room_id == room_id, User.is_host == False).order_by(
+            User.score.desc(), User.id
+        ).limit(limit).all()
+        return [UserResponse(
+            id=user.id,
+            name=user.name,
+            score=user.score,
+            is_host=user.is_host,
+            room_id=user.room_id
+        ).dict() for user in users]
+    finally:
+        db.close()
+
+async def build_spectator_frame(room_id: str) -> str:
+    # Read-only: never create (or restore) room state for a spectator
+    room_game_state = game_states.get(room_id)
+    if room_game_state is None:
+        return json.dumps({
+            "type": "spectator_frame",
+            "state": None,
+            "question": None,
+            "leaderboard": []
+        })
+    question = None
+    if room_game_state["is_question_active"]:
+        cached = question_cache.get(room_game_state["current_question"])
+        if cached:
+            question = QuestionResponse(**cached).dict()
+    leaderboard = await asyncio.to_thread(get_leaderboard, room_id, SPECTATOR_LEADERBOARD_SIZE)
+    return json.dumps({
+        "type": "spectator_frame",
+        "state": {
+            "is_registration_open": room_game_state["is_registration_open"],
+            "is_game_started": room_game_state["is_game_started"],
+            "is_question_active": room_game_state["is_question_active"],
+            "question_timer": room_game_state["question_timer"]
+        },
+        "question": question,
+        "leaderboard": leaderboard
+    })
+
+spectator_hub = SpectatorHub()
+spectator_feed = SpectatorFeed(spectator_hub, build_spectator_frame, SPECTATOR_FRAME_INTERVAL)
+
 # API Routes
 @app.get("/")
 async def root():
     return {"message": "Jeopardy Trivia API"}
 
-@app.post("/register", response_model=UserResponse)
+@app.get("/ready")
+async def ready():
+    if not all(readiness.values()):
+        raise HTTPException(status_code=503, detail={"ready": False, **readiness})
+    return {"ready": True, **readiness}
+
+@app.post("/register", response_model=RegisterResponse)
 async def register_user(user: UserCreate, db: Session = Depends(get_db)):
+    ensure_serving()
     # Reject new registrations if registration is closed for this room
     room_game_state = get_game_state(user.room_id)
     if not room_game_state.get("is_registration_open", False):
         raise HTTPException(status_code=403, detail="Registration is closed")
     db_user = create_user(db, user)
-    return UserResponse(
+    spectator_feed.mark_dirty(user.room_id)
+    return RegisterResponse(
         id=db_user.id,
         name=db_user.name,
         score=db_user.score,
         is_host=db_user.is_host,
-        room_id=db_user.room_id
+        room_id=db_user.room_id,
+        token=create_player_token(db_user.id, db_user.room_id)
     )
 
 @app.get("/users")
@@ -302,6 +535,7 @@ async def get_all_users(room_id: str, db: Session = Depends(get_db)):
 
 @app.post("/start-registration")
 async def start_registration(room_id: str):
+    ensure_serving()
     room_game_state = get_game_state(room_id)
     room_game_state["is_registration_open"] = True
     await manager.broadcast(json.dumps({
@@ -312,13 +546,16 @@ async def start_registration(room_id: str):
 
 @app.post("/start-game")
 async def start_game(room_id: str, db: Session = Depends(get_db)):
+    ensure_serving()
     room_game_state = get_game_state(room_id)
     room_game_state["is_registration_open"] = False
     room_game_state["is_game_started"] = True
     room_game_state["is_question_active"] = False
     room_game_state["current_question"] = None
     room_game_state["question_timer"] = 0
+    room_game_state["question_started_at"] = None
     room_game_state["asked_ids"] = []
+    answer_ledger.clear(room_id)
     
     # Reset previous game data for this room only (scores/answers), and reset active question globally
     try:
@@ -346,13 +583,14 @@ async def start_game(room_id: str, db: Session = Depends(get_db)):
 
 @app.post("/start-first-question")
 async def start_first_question(room_id: str, db: Session = Depends(get_db)):
+    ensure_serving()
     # Use global questions (room_id is None);
     # avoid repeats per room using asked_ids and questions already answered in this room
     room_game_state = get_game_state(room_id)
     asked_ids = room_game_state.get("asked_ids", [])
     used_ids = [qid for (qid,) in db.query(RoomUsedQuestion.question_id).filter(RoomUsedQuestion.room_id == room_id).distinct().all()]
     exclude_ids = set(asked_ids) | set(used_ids)
-    query = db.query(Question).filter(Question.room_id == None, Question.is_active == False)
+    query = db.query(Question).filter(Question.room_id == None, Question.is_active == False, Question.is_deleted == False)
     if exclude_ids:
         query = query.filter(~Question.id.in_(list(exclude_ids)))
     available = query.all()
@@ -369,6 +607,9 @@ async def start_first_question(room_id: str, db: Session = Depends(get_db)):
         room_game_state["current_question"] = first_q.id
         room_game_state["is_question_active"] = True
         room_game_state["question_timer"] = 15
+        answer_ledger.start_question(room_id, first_q.id)
+        # Fresh copy for scoring, even if another replica synced or edited it
+        cache_question(first_q)
         # track asked question
         # persist as used for this room
         db.add(RoomUsedQuestion(room_id=room_id, question_id=first_q.id))
@@ -395,6 +636,8 @@ async def start_first_question(room_id: str, db: Session = Depends(get_db)):
             "timer": 15
         })
         print(f"Broadcasting first question for room {room_id}: {message}")
+        # Response times are measured from here, after the DB writes above
+        room_game_state["question_started_at"] = time.time()
         await manager.broadcast(message, room_id)
         
         return {"message": "First question started"}
@@ -403,12 +646,13 @@ async def start_first_question(room_id: str, db: Session = Depends(get_db)):
 
 @app.post("/next-question")
 async def next_question(room_id: str, db: Session = Depends(get_db)):
+    ensure_serving()
     print(f"Next question requested for room {room_id}")
     # Set current question as inactive for this room
     set_question_inactive(db, None)
     
     # Debug: total global questions
-    all_questions = db.query(Question).filter(Question.room_id == None).all()
+    all_questions = db.query(Question).filter(Question.room_id == None, Question.is_deleted == False).all()
     print(f"Total global questions: {len(all_questions)}")
     for q in all_questions:
         print(f"Question {q.id}: active={q.is_active}, text={q.question_text[:50]}...")
@@ -418,7 +662,7 @@ async def next_question(room_id: str, db: Session = Depends(get_db)):
     asked_ids = room_game_state.get("asked_ids", [])
     used_ids = [qid for (qid,) in db.query(RoomUsedQuestion.question_id).filter(RoomUsedQuestion.room_id == room_id).distinct().all()]
     exclude_ids = set(asked_ids) | set(used_ids)
-    query = db.query(Question).filter(Question.room_id == None, Question.is_active == False)
+    query = db.query(Question).filter(Question.room_id == None, Question.is_active == False, Question.is_deleted == False)
     if exclude_ids:
         query = query.filter(~Question.id.in_(list(exclude_ids)))
     available_questions = query.all()
@@ -439,6 +683,9 @@ async def next_question(room_id: str, db: Session = Depends(get_db)):
         room_game_state["current_question"] = next_q.id
         room_game_state["is_question_active"] = True
         room_game_state["question_timer"] = 15
+        answer_ledger.start_question(room_id, next_q.id)
+        # Fresh copy for scoring, even if another replica synced or edited it
+        cache_question(next_q)
         # track asked question
         # persist as used for this room
         db.add(RoomUsedQuestion(room_id=room_id, question_id=next_q.id))
@@ -465,6 +712,8 @@ async def next_question(room_id: str, db: Session = Depends(get_db)):
             "timer": 15
         })
         print(f"Broadcasting next question for room {room_id}: {message}")
+        # Response times are measured from here, after the DB writes above
+        room_game_state["question_started_at"] = time.time()
         await manager.broadcast(message, room_id)
         
         return {"message": "Next question started"}
@@ -490,62 +739,90 @@ async def next_question(room_id: str, db: Session = Depends(get_db)):
         
         return {"message": "Game finished"}
 
-@app.post("/submit-answer")
-async def submit_answer(answer: AnswerSubmit, db: Session = Depends(get_db)):
+# Answer validation
+SPEED_BONUS_POINTS = int(os.getenv("SPEED_BONUS_POINTS", "0"))  # extra points for an instant answer, 0 disables
+
+def authenticate_player(token: Optional[str], room_id: str) -> int:
+    """Return the user id bound to a player token for this room"""
+    claims = verify_player_token(token) if token else None
+    if not claims:
+        raise HTTPException(status_code=401, detail="Invalid or missing player token")
+    if claims["room_id"] != room_id:
+        raise HTTPException(status_code=403, detail="Player token is for another room")
+    return claims["user_id"]
+
+def process_answer(db: Session, user_id: int, answer: AnswerSubmit) -> Dict:
+    """
+    Validate and score one answer using only in-memory state; the database is
+    only written to (answer row and score increment).
+    """
+    received_at = time.time()
+    if not answer.selected_answer:
+        raise HTTPException(status_code=400, detail="selected_answer is required")
+
+    room_game_state = get_game_state(answer.room_id)
+    if not room_game_state["is_question_active"]:
+        raise HTTPException(status_code=400, detail="No active question for this room")
+    if room_game_state["current_question"] != answer.question_id:
+        raise HTTPException(status_code=400, detail=f"Question ID mismatch: expected {room_game_state['current_question']}, got {answer.question_id}")
+
+    replayed = answer_ledger.replay(answer.room_id, answer.question_id, user_id, answer.idempotency_key)
+    if replayed is not None:
+        return replayed
+    if not answer_ledger.claim(answer.room_id, answer.question_id, user_id):
+        raise HTTPException(status_code=409, detail="Question already answered")
+
     try:
-        # Validate required fields
-        if not answer.room_id:
-            raise HTTPException(status_code=400, detail="room_id is required")
-        if not answer.user_id:
-            raise HTTPException(status_code=400, detail="user_id is required")
-        if not answer.question_id:
-            raise HTTPException(status_code=400, detail="question_id is required")
-        if not answer.selected_answer:
-            raise HTTPException(status_code=400, detail="selected_answer is required")
-        
-        room_game_state = get_game_state(answer.room_id)
-        if not room_game_state["is_question_active"]:
-            raise HTTPException(status_code=400, detail="No active question for this room")
-        
-        # Get the active question for this room
-        # First try to find question with room_id, then fallback to question_id match
-        question = get_active_question(db, answer.room_id)
-        
-        # If no question found by room_id, try to find by question_id and room_id in state
+        question = question_cache.get(answer.question_id)
         if not question:
-            question = db.query(Question).filter(
-                Question.id == answer.question_id,
-                Question.is_active == True
-            ).first()
-            
-            # If found and doesn't have room_id, assign it
-            if question and not question.room_id:
-                question.room_id = answer.room_id
-                db.commit()
-        
+            # Question started before this worker cached it (e.g. restored room)
+            db_question = db.query(Question).filter(Question.id == answer.question_id).first()
+            if db_question:
+                cache_question(db_question)
+                question = question_cache[db_question.id]
         if not question:
             raise HTTPException(status_code=400, detail=f"No active question found for room {answer.room_id} (question_id: {answer.question_id})")
-        
-        # Verify the question_id matches
-        if question.id != answer.question_id:
-            raise HTTPException(status_code=400, detail=f"Question ID mismatch: expected {answer.question_id}, found {question.id}")
-        
-        # Check if answer is correct
-        is_correct = answer.selected_answer == question.correct_answer
-        
-        # Save the answer
-        save_user_answer(db, answer.user_id, answer.question_id, answer.selected_answer, is_correct, answer.room_id)
-        
-        # Update user score
-        user = get_user_by_id(db, answer.user_id)
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-        
+
+        started_at = room_game_state.get("question_started_at")
+        response_time_ms = int((received_at - started_at) * 1000) if started_at else None
+        is_correct = answer.selected_answer == question["correct_answer"]
+
+        points = 0
         if is_correct:
-            user.score += 1
-            db.commit()
-        
-        return {"correct": is_correct, "score": user.score}
+            points = 1
+            timer = room_game_state.get("question_timer") or 0
+            if SPEED_BONUS_POINTS and response_time_ms is not None and timer:
+                points += round(SPEED_BONUS_POINTS * max(0.0, 1 - response_time_ms / (timer * 1000)))
+
+        score = db.execute(
+            update(User).where(User.id == user_id).values(score=User.score + points).returning(User.score)
+        ).scalar()
+        if score is None:
+            db.rollback()
+            raise HTTPException(status_code=404, detail="User not found")
+        # Commits the score update together with the answer
+        save_user_answer(db, user_id, answer.question_id, answer.selected_answer, is_correct, answer.room_id, response_time_ms)
+    except Exception:
+        answer_ledger.release(answer.room_id, answer.question_id, user_id)
+        raise
+
+    if points:
+        spectator_feed.mark_dirty(answer.room_id)
+    result = {"correct": is_correct, "score": score, "points": points, "response_time_ms": response_time_ms}
+    answer_ledger.remember(answer.room_id, answer.question_id, user_id, answer.idempotency_key, result)
+    return result
+
+@app.post("/submit-answer")
+async def submit_answer(answer: AnswerSubmit, authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
+    try:
+        # Validate required fields
+        if not answer.room_id:
+            raise HTTPException(status_code=400, detail="room_id is required")
+        token = authorization[len("Bearer "):] if authorization and authorization.startswith("Bearer ") else None
+        user_id = authenticate_player(token, answer.room_id)
+        if answer.user_id and answer.user_id != user_id:
+            raise HTTPException(status_code=403, detail="user_id does not match the player token")
+        return process_answer(db, user_id, answer)
     except HTTPException:
         raise
     except Exception as e:
@@ -556,7 +833,7 @@ async def submit_answer(answer: AnswerSubmit, db: Session = Depends(get_db)):
 @app.get("/questions")
 async def get_all_questions(db: Session = Depends(get_db)):
     """Get all questions from database (for admin panel)"""
-    questions = db.query(Question).all()
+    questions = db.query(Question).filter(Question.is_deleted == False).all()
     return [QuestionResponse(
         id=q.id,
         question_text=q.question_text,
@@ -582,6 +859,7 @@ async def create_question(question: dict, db: Session = Depends(get_db)):
         db.add(new_question)
         db.commit()
         db.refresh(new_question)
+        cache_question(new_question)
         return {"message": "Question created", "id": new_question.id}
     except Exception as e:
         db.rollback()
@@ -603,6 +881,7 @@ async def update_question(question_id: int, question: dict, db: Session = Depend
         db_question.correct_answer = question['correct_answer']
         
         db.commit()
+        cache_question(db_question)
         return {"message": "Question updated"}
     except Exception as e:
         db.rollback()
@@ -618,6 +897,7 @@ async def delete_question(question_id: int, db: Session = Depends(get_db)):
         
         db.delete(db_question)
         db.commit()
+        question_cache.pop(question_id, None)
         return {"message": "Question deleted"}
     except Exception as e:
         db.rollback()
@@ -629,12 +909,26 @@ async def websocket_endpoint(websocket: WebSocket):
     query_params = websocket.query_params
     room_id = query_params.get("room_id", "default")
     print(f"WebSocket connection: room_id={room_id}")
+    if not readiness["serving"]:
+        # Draining: send the client to another worker
+        await websocket.close(code=1012)
+        return
     await manager.connect(websocket, room_id)
     try:
         while True:
             data = await websocket.receive_text()
-            message = json.loads(data)
-            
+            try:
+                message = json.loads(data)
+            except ValueError:
+                message = None
+            if not isinstance(message, dict):
+                # Bad frames get an error reply, the connection stays open
+                await manager.send_personal_message(json.dumps({
+                    "type": "error",
+                    "message": "Invalid message, expected a JSON object"
+                }), websocket)
+                continue
+
             if message.get("type") == "host_connect":
                 manager.host_connections[room_id] = websocket
                 await manager.send_personal_message(json.dumps({
@@ -642,16 +936,76 @@ async def websocket_endpoint(websocket: WebSocket):
                     "message": "You are now the host"
                 }), websocket)
             
+            elif message.get("type") == "player_connect":
+                # Bind this connection to the player that owns the token
+                claims = verify_player_token(message.get("token", ""))
+                if not claims or claims["room_id"] != room_id:
+                    await manager.send_personal_message(json.dumps({
+                        "type": "error",
+                        "message": "Invalid player token"
+                    }), websocket)
+                else:
+                    manager.connection_users[websocket] = claims["user_id"]
+                    await manager.send_personal_message(json.dumps({
+                        "type": "player_confirmed",
+                        "user_id": claims["user_id"]
+                    }), websocket)
+
+            elif message.get("type") == "submit_answer":
+                user_id = manager.connection_users.get(websocket)
+                payload = message.get("answer")
+                try:
+                    if user_id is None:
+                        raise HTTPException(status_code=401, detail="Connection is not bound to a player")
+                    if not isinstance(payload, dict):
+                        raise HTTPException(status_code=422, detail="answer must be an object")
+                    answer = AnswerSubmit(**{**payload, "room_id": room_id})
+                    db = SessionLocal()
+                    try:
+                        reply = {"type": "answer_result", **process_answer(db, user_id, answer)}
+                    finally:
+                        db.close()
+                except HTTPException as e:
+                    reply = {"type": "answer_error", "status": e.status_code, "detail": e.detail}
+                except ValueError as e:
+                    reply = {"type": "answer_error", "status": 422, "detail": str(e)}
+                except Exception as e:
+                    print(f"Error in websocket submit_answer: {e}")
+                    reply = {"type": "answer_error", "status": 400, "detail": f"Error processing answer: {str(e)}"}
+                await manager.send_personal_message(json.dumps(reply), websocket)
+
             elif message.get("type") == "get_game_state":
-                room_game_state = get_game_state(room_id)
+                # While draining, report rooms without creating new ones
+                room_game_state = get_game_state(room_id) if readiness["serving"] else game_states.get(room_id)
                 await manager.send_personal_message(json.dumps({
                     "type": "game_state",
                     "state": room_game_state
                 }), websocket)
                 
     except WebSocketDisconnect:
+        pass
+    finally:
+        # Also on unexpected errors, so dead sockets never stay registered
         manager.disconnect(websocket)
 
+@app.websocket("/ws/spectate")
+async def spectator_endpoint(websocket: WebSocket):
+    """Read-only feed for displays and audience, kept apart from the players' connections"""
+    room_id = websocket.query_params.get("room_id", "default")
+    if not readiness["serving"]:
+        await websocket.close(code=1012)
+        return
+    await spectator_hub.connect(websocket, room_id)
+    spectator_feed.mark_dirty(room_id)
+    try:
+        while True:
+            # Spectators cannot send commands; reading only detects the disconnect
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        spectator_hub.disconnect(websocket, room_id)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
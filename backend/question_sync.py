@@ -0,0 +1,152 @@
+"""
+Question bank sync: parses questions.txt, diffs it by content hash against the
+database and watches the file for changes (including ConfigMap symlink swaps)
+"""
+import asyncio
+import hashlib
+import os
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+QUESTION_FIELDS = ("question_text", "option_a", "option_b", "option_c", "option_d", "correct_answer")
+
+# Parse questions.txt content into question dicts
+def parse_questions(content: str) -> List[Dict]:
+    questions = []
+    content = content.replace("\r\n", "\n")
+    for block in content.split("\n\n"):
+        if not block.strip():
+            continue
+
+        lines = [line.strip() for line in block.strip().split("\n")]
+        if len(lines) >= 6:
+            questions.append({
+                "question_text": lines[0],
+                "option_a": lines[1].replace("A) ", ""),
+                "option_b": lines[2].replace("B) ", ""),
+                "option_c": lines[3].replace("C) ", ""),
+                "option_d": lines[4].replace("D) ", ""),
+                "correct_answer": lines[5].replace("correcta:", "").strip()
+            })
+    return questions
+
+def question_key(question_text: str) -> str:
+    """Identity of a question in the file: hash of its normalized text"""
+    normalized = " ".join(question_text.split()).lower()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+def content_hash(question: Dict) -> str:
+    """Hash of every field, used to detect edits to an existing question"""
+    payload = "\x1f".join(question.get(name) or "" for name in QUESTION_FIELDS)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+@dataclass
+class QuestionDiff:
+    inserts: List[Dict] = field(default_factory=list)  # question dicts (with source_key/content_hash)
+    updates: List[Tuple[int, Dict]] = field(default_factory=list)  # (question id, question dict)
+    deletes: List[int] = field(default_factory=list)  # question ids to soft delete
+
+    def is_empty(self) -> bool:
+        return not (self.inserts or self.updates or self.deletes)
+
+    def summary(self) -> str:
+        return f"{len(self.inserts)} inserted, {len(self.updates)} updated, {len(self.deletes)} deleted"
+
+def compute_diff(file_questions: List[Dict], existing: Dict[str, Tuple[int, str, bool]]) -> QuestionDiff:
+    """
+    Compare parsed file questions against the file-managed rows in the bank.
+    `existing` maps source_key -> (question id, content_hash, is_deleted).
+    """
+    diff = QuestionDiff()
+    seen = set()
+    for question in file_questions:
+        key = question_key(question["question_text"])
+        if key in seen:
+            continue  # duplicated question in the file, first one wins
+        seen.add(key)
+        row = dict(question, source_key=key, content_hash=content_hash(question))
+
+        if key not in existing:
+            diff.inserts.append(row)
+            continue
+        question_id, current_hash, is_deleted = existing[key]
+        if is_deleted or current_hash != row["content_hash"]:
+            diff.updates.append((question_id, row))
+
+    for key, (question_id, _, is_deleted) in existing.items():
+        if key not in seen and not is_deleted:
+            diff.deletes.append(question_id)
+    return diff
+
+class QuestionFileWatcher:
+    """
+    Polls the questions file and calls `on_change` with the parsed questions
+    whenever its content changes. os.stat follows symlinks, so the atomic
+    `..data` swap Kubernetes does on ConfigMap updates is picked up as well.
+    """
+
+    def __init__(self, path: str, on_change: Callable[[List[Dict]], Awaitable[None]], interval: float = 5.0):
+        self.path = path
+        self.on_change = on_change
+        self.interval = interval
+        self._signature: Optional[Tuple] = None
+        self._file_hash: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _stat_signature(self) -> Optional[Tuple]:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (os.path.realpath(self.path), st.st_ino, st.st_mtime_ns, st.st_size)
+
+    async def check(self) -> bool:
+        """Run the callback if the file changed since the last check"""
+        signature = self._stat_signature()
+        if signature is None or signature == self._signature:
+            return False
+        try:
+            with open(self.path, "rb") as f:
+                raw = f.read()
+        except OSError as e:
+            print(f"Error reading questions file {self.path}: {e}")
+            return False
+
+        file_hash = hashlib.sha256(raw).hexdigest()
+        self._signature = signature
+        if file_hash == self._file_hash:
+            return False  # touched but unchanged
+
+        await self.on_change(parse_questions(raw.decode("utf-8")))
+        self._file_hash = file_hash
+        return True
+
+    async def safe_check(self) -> bool:
+        """check() that logs errors instead of raising; a bad file never stops the app"""
+        try:
+            return await self.check()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Leave the hash untouched so the change is retried next poll
+            self._signature = None
+            print(f"Error syncing questions file {self.path}: {e}")
+            return False
+
+    async def _run(self):
+        while True:
+            await self.safe_check()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
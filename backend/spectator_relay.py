@@ -0,0 +1,80 @@
+"""
+Spectator relay: a separate process that fans the backend's spectator feed
+out to many viewers. It holds one upstream subscription per room and
+forwards every frame unchanged, so the gameplay workers only ever see one
+spectator per relay instance.
+
+Run with: uvicorn spectator_relay:app --host 0.0.0.0 --port 8001
+"""
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import Dict
+from urllib.parse import quote
+
+import websockets
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+
+from spectators import SpectatorHub
+
+# Backend spectator endpoint, e.g. ws://jeopardy-backend:8000/ws/spectate
+UPSTREAM_URL = os.getenv("SPECTATOR_UPSTREAM_URL", "ws://localhost:8000/ws/spectate")
+UPSTREAM_RECONNECT_DELAY = float(os.getenv("SPECTATOR_UPSTREAM_RECONNECT_DELAY", "1"))
+
+hub = SpectatorHub()
+upstreams: Dict[str, asyncio.Task] = {}  # room_id -> upstream subscription
+
+async def follow_upstream(room_id: str):
+    url = f"{UPSTREAM_URL}?room_id={quote(room_id)}"
+    while True:
+        try:
+            async with websockets.connect(url) as upstream:
+                async for frame in upstream:
+                    await hub.publish(room_id, frame)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Includes 1012 from a draining backend: reconnect to another worker
+            print(f"Upstream for room {room_id} lost: {e}")
+        await asyncio.sleep(UPSTREAM_RECONNECT_DELAY)
+
+def ensure_upstream(room_id: str):
+    if room_id not in upstreams:
+        upstreams[room_id] = asyncio.create_task(follow_upstream(room_id))
+
+def release_upstream(room_id: str):
+    if hub.count(room_id) == 0 and room_id in upstreams:
+        upstreams.pop(room_id).cancel()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    for task in upstreams.values():
+        task.cancel()
+    upstreams.clear()
+    await hub.close_all(code=1012)
+
+app = FastAPI(lifespan=lifespan)
+
+@app.get("/")
+async def root():
+    return {"message": "Jeopardy Spectator Relay", "rooms": len(hub.rooms)}
+
+@app.get("/ready")
+async def ready():
+    return {"ready": True}
+
+@app.websocket("/ws/spectate")
+async def spectator_endpoint(websocket: WebSocket):
+    room_id = websocket.query_params.get("room_id", "default")
+    await hub.connect(websocket, room_id)
+    ensure_upstream(room_id)
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        # Also on unexpected errors, so the upstream is dropped with its last viewer
+        hub.disconnect(websocket, room_id)
+        release_upstream(room_id)
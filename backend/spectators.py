@@ -0,0 +1,111 @@
+"""
+Spectator fan-out: read-only viewers (big-screen displays, audience) get a
+throttled, coalesced feed instead of the full gameplay event stream. Every
+frame is encoded once and the same string is sent to all spectators of a room.
+"""
+import asyncio
+from typing import Awaitable, Callable, Dict, Optional, Set
+
+from fastapi import WebSocket
+
+class SpectatorHub:
+    """Spectator connections per room plus the last frame sent to each room"""
+
+    def __init__(self, send_timeout: float = 2.0):
+        self.rooms: Dict[str, Set[WebSocket]] = {}  # room_id -> spectators
+        self.last_frames: Dict[str, str] = {}  # room_id -> last pre-encoded frame
+        self.send_timeout = send_timeout
+
+    async def connect(self, websocket: WebSocket, room_id: str):
+        await websocket.accept()
+        self.rooms.setdefault(room_id, set()).add(websocket)
+        # Late joiners get the current picture right away
+        frame = self.last_frames.get(room_id)
+        if frame is not None:
+            await self._send(websocket, room_id, frame)
+
+    def disconnect(self, websocket: WebSocket, room_id: str):
+        spectators = self.rooms.get(room_id)
+        if spectators is None:
+            return
+        spectators.discard(websocket)
+        if not spectators:
+            del self.rooms[room_id]
+            self.last_frames.pop(room_id, None)
+
+    def count(self, room_id: str) -> int:
+        return len(self.rooms.get(room_id, ()))
+
+    async def _send(self, websocket: WebSocket, room_id: str, frame: str):
+        try:
+            await asyncio.wait_for(websocket.send_text(frame), self.send_timeout)
+        except Exception:
+            # Slow or gone: drop it rather than hold back the rest of the room
+            self.disconnect(websocket, room_id)
+            try:
+                await websocket.close(code=1011)
+            except Exception:
+                pass
+
+    async def publish(self, room_id: str, frame: str):
+        self.last_frames[room_id] = frame
+        spectators = list(self.rooms.get(room_id, ()))
+        if spectators:
+            await asyncio.gather(*(self._send(ws, room_id, frame) for ws in spectators))
+
+    async def close_all(self, code: int = 1000):
+        for room_id, spectators in list(self.rooms.items()):
+            for websocket in list(spectators):
+                try:
+                    await websocket.close(code=code)
+                except Exception:
+                    pass
+        self.rooms.clear()
+        self.last_frames.clear()
+
+class SpectatorFeed:
+    """
+    Coalesces room updates: mark_dirty() is cheap and can be called on every
+    gameplay event; at most one frame per room is built and published every
+    `interval` seconds, and only for rooms that have spectators.
+    """
+
+    def __init__(self, hub: SpectatorHub, build_frame: Callable[[str], Awaitable[str]], interval: float = 0.5):
+        self.hub = hub
+        self.build_frame = build_frame
+        self.interval = interval
+        self._dirty: Set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def mark_dirty(self, room_id: str):
+        self._dirty.add(room_id)
+
+    async def flush(self):
+        dirty, self._dirty = self._dirty, set()
+        for room_id in dirty:
+            if not self.hub.count(room_id):
+                continue
+            try:
+                frame = await self.build_frame(room_id)
+            except Exception as e:
+                print(f"Error building spectator frame for room {room_id}: {e}")
+                continue
+            await self.hub.publish(room_id, frame)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
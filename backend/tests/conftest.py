@@ -0,0 +1,10 @@
+import os
+import sys
+import tempfile
+
+# Make the backend modules importable and point the app at a throwaway database
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/jeopardy-test.db")
+os.environ.setdefault("PLAYER_TOKEN_SECRET", "test-secret")
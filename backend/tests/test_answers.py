@@ -0,0 +1,69 @@
+import json
+
+from answers import AnswerLedger, create_player_token, verify_player_token
+
+def test_player_token_round_trip():
+    token = create_player_token(7, "sala-1")
+    assert verify_player_token(token) == {"user_id": 7, "room_id": "sala-1"}
+
+def test_player_token_rejects_tampering():
+    token = create_player_token(7, "sala-1")
+    assert verify_player_token(token[:-2] + "xx") is None
+    assert verify_player_token("") is None
+
+def test_claim_once_per_user_and_question():
+    ledger = AnswerLedger()
+    ledger.start_question("r", 1)
+    assert ledger.claim("r", 1, 10) is True
+    assert ledger.claim("r", 1, 10) is False
+    assert ledger.claim("r", 1, 11) is True
+    # A new question starts a clean slate
+    assert ledger.claim("r", 2, 10) is True
+
+def test_release_allows_retry():
+    ledger = AnswerLedger()
+    ledger.start_question("r", 1)
+    assert ledger.claim("r", 1, 10)
+    ledger.release("r", 1, 10)
+    assert ledger.claim("r", 1, 10) is True
+
+def test_rooms_are_independent():
+    ledger = AnswerLedger()
+    assert ledger.claim("a", 1, 10)
+    assert ledger.claim("b", 1, 10)
+
+def test_replay_is_scoped_to_user():
+    ledger = AnswerLedger()
+    ledger.start_question("r", 1)
+    response = {"is_correct": True, "score": 1}
+    ledger.remember("r", 1, 10, "key-1", response)
+
+    assert ledger.replay("r", 1, 10, "key-1") == response
+    # Same key from another player never leaks the first player's result
+    assert ledger.replay("r", 1, 11, "key-1") is None
+    assert ledger.replay("r", 1, 10, None) is None
+    # Stale question ids do not replay either
+    assert ledger.replay("r", 2, 10, "key-1") is None
+
+def test_snapshot_restore_round_trip():
+    ledger = AnswerLedger()
+    ledger.start_question("r", 3)
+    ledger.claim("r", 3, 12)
+    ledger.claim("r", 3, 10)
+    ledger.remember("r", 3, 10, "k", {"score": 2})
+
+    # Checkpoints go through JSON on their way to the next worker
+    snapshot = json.loads(json.dumps(ledger.snapshot("r")))
+    assert snapshot["user_ids"] == [10, 12]
+
+    restored = AnswerLedger()
+    restored.restore("r", snapshot)
+    assert restored.claim("r", 3, 10) is False
+    assert restored.claim("r", 3, 11) is True
+    assert restored.replay("r", 3, 10, "k") == {"score": 2}
+
+def test_snapshot_and_restore_of_unknown_room():
+    ledger = AnswerLedger()
+    assert ledger.snapshot("missing") is None
+    ledger.restore("missing", None)
+    assert "missing" not in ledger.rooms
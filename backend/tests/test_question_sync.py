@@ -0,0 +1,150 @@
+import asyncio
+import os
+
+from question_sync import QuestionFileWatcher, compute_diff, content_hash, parse_questions, question_key
+
+SAMPLE = """¿Qué es Docker?
+A) Un sistema operativo
+B) Una plataforma de contenedores
+C) Un lenguaje de programación
+D) Una base de datos
+correcta:B
+
+¿Qué significa HTML?
+A) HyperText Markup Language
+B) High Tech Modern Language
+C) Home Tool Markup Language
+D) Hyperlink and Text Markup Language
+correcta:A
+"""
+
+def existing_rows(questions, deleted=()):
+    """source_key -> (id, content_hash, is_deleted) as the database would report it"""
+    return {
+        question_key(q["question_text"]): (i + 1, content_hash(q), i + 1 in deleted)
+        for i, q in enumerate(questions)
+    }
+
+def test_parse_questions():
+    questions = parse_questions(SAMPLE.replace("\n", "\r\n"))
+    assert [q["correct_answer"] for q in questions] == ["B", "A"]
+    assert questions[0]["option_b"] == "Una plataforma de contenedores"
+
+def test_question_key_ignores_case_and_spacing():
+    assert question_key("¿Qué es  Docker?") == question_key("¿qué es docker? ")
+
+def test_compute_diff_inserts_new_questions():
+    diff = compute_diff(parse_questions(SAMPLE), {})
+    assert len(diff.inserts) == 2
+    assert diff.inserts[0]["source_key"] == question_key("¿Qué es Docker?")
+    assert not diff.updates and not diff.deletes
+
+def test_compute_diff_unchanged_file_is_empty():
+    questions = parse_questions(SAMPLE)
+    assert compute_diff(questions, existing_rows(questions)).is_empty()
+
+def test_compute_diff_updates_edited_question():
+    questions = parse_questions(SAMPLE)
+    existing = existing_rows(questions)
+    edited = parse_questions(SAMPLE.replace("correcta:B", "correcta:C"))
+    diff = compute_diff(edited, existing)
+    assert [(qid, row["correct_answer"]) for qid, row in diff.updates] == [(1, "C")]
+    assert not diff.inserts and not diff.deletes
+
+def test_compute_diff_undeletes_question_back_in_file():
+    questions = parse_questions(SAMPLE)
+    diff = compute_diff(questions, existing_rows(questions, deleted={2}))
+    assert [qid for qid, _ in diff.updates] == [2]
+
+def test_compute_diff_soft_deletes_removed_questions_once():
+    questions = parse_questions(SAMPLE)
+    existing = existing_rows(questions)
+    diff = compute_diff(questions[:1], existing)
+    assert diff.deletes == [2]
+    # Already deleted rows are not deleted again
+    assert compute_diff(questions[:1], existing_rows(questions, deleted={2})).is_empty()
+
+def test_compute_diff_duplicate_questions_first_wins():
+    questions = parse_questions(SAMPLE)
+    duplicate = dict(questions[0], correct_answer="D")
+    diff = compute_diff([questions[0], duplicate], {})
+    assert len(diff.inserts) == 1
+    assert diff.inserts[0]["correct_answer"] == "B"
+
+def test_apply_question_file_does_not_adopt_tracked_keys():
+    import database
+    from main import apply_question_file
+
+    database.init_database()
+    db = database.SessionLocal()
+    try:
+        questions = parse_questions(SAMPLE)
+        apply_question_file(db, questions)
+        # Admin question with the same text as a tracked file question
+        db.add(database.Question(**questions[0], is_active=False, is_deleted=False))
+        db.commit()
+
+        diff, _ = apply_question_file(db, questions)
+        assert diff.is_empty()
+        tracked = db.query(database.Question).filter(
+            database.Question.source_key == question_key(questions[0]["question_text"])
+        ).count()
+        assert tracked == 1
+    finally:
+        db.close()
+
+class Recorder:
+    def __init__(self, fail_times=0):
+        self.calls = []
+        self.fail_times = fail_times
+
+    async def __call__(self, questions):
+        if self.fail_times:
+            self.fail_times -= 1
+            raise RuntimeError("database is locked")
+        self.calls.append(questions)
+
+def test_watcher_ignores_touch_without_content_change(tmp_path):
+    path = tmp_path / "questions.txt"
+    path.write_text(SAMPLE, encoding="utf-8")
+    recorder = Recorder()
+    watcher = QuestionFileWatcher(str(path), recorder)
+
+    assert asyncio.run(watcher.check()) is True
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert asyncio.run(watcher.check()) is False
+    assert len(recorder.calls) == 1
+
+def test_watcher_follows_configmap_symlink_swap(tmp_path):
+    # Kubernetes layout: questions.txt -> ..data/questions.txt, ..data -> timestamped dir
+    for name, content in (("v1", SAMPLE), ("v2", SAMPLE.replace("correcta:B", "correcta:C"))):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "questions.txt").write_text(content, encoding="utf-8")
+    os.symlink("v1", tmp_path / "..data")
+    os.symlink("..data/questions.txt", tmp_path / "questions.txt")
+    recorder = Recorder()
+    watcher = QuestionFileWatcher(str(tmp_path / "questions.txt"), recorder)
+    assert asyncio.run(watcher.check()) is True
+
+    # Atomic swap, as kubelet does it
+    os.symlink("v2", tmp_path / "..data_tmp")
+    os.replace(tmp_path / "..data_tmp", tmp_path / "..data")
+    assert asyncio.run(watcher.check()) is True
+    assert recorder.calls[-1][0]["correct_answer"] == "C"
+
+def test_watcher_retries_after_error(tmp_path):
+    path = tmp_path / "questions.txt"
+    path.write_text(SAMPLE, encoding="utf-8")
+    recorder = Recorder(fail_times=1)
+    watcher = QuestionFileWatcher(str(path), recorder)
+
+    assert asyncio.run(watcher.safe_check()) is False
+    assert asyncio.run(watcher.safe_check()) is True
+    assert len(recorder.calls) == 1
+
+def test_watcher_survives_non_utf8_file(tmp_path):
+    path = tmp_path / "questions.txt"
+    path.write_bytes(b"\xff\xfe bad")
+    watcher = QuestionFileWatcher(str(path), Recorder())
+    assert asyncio.run(watcher.safe_check()) is False
@@ -57,17 +57,33 @@ export default function HostPanel({ onGameStateChange }: { onGameStateChange: (s
     setRegistrationUrl(url)
 
     // WebSocket connection with room ID
-    const websocket = new WebSocket(`${WS_URL}?room_id=${newRoomId}`)
-    websocket.onopen = () => {
-      websocket.send(JSON.stringify({ type: 'host_connect' }))
-    }
-    websocket.onmessage = (event) => {
-      const data = JSON.parse(event.data)
-      handleWebSocketMessage(data)
+    let websocket: WebSocket
+    let closedByUs = false
+    let retryAfterMs = 1000
+    const connect = () => {
+      websocket = new WebSocket(`${WS_URL}?room_id=${newRoomId}`)
+      websocket.onopen = () => {
+        websocket.send(JSON.stringify({ type: 'host_connect' }))
+      }
+      websocket.onmessage = (event) => {
+        const data = JSON.parse(event.data)
+        if (data.type === 'server_draining' && data.retry_after_ms) {
+          retryAfterMs = data.retry_after_ms
+        }
+        handleWebSocketMessage(data)
+      }
+      websocket.onclose = (event) => {
+        // 1012: the server is restarting, the room resumes on another worker
+        if (!closedByUs && event.code === 1012) {
+          setTimeout(connect, retryAfterMs)
+        }
+      }
+      setWs(websocket)
     }
-    setWs(websocket)
+    connect()
 
     return () => {
+      closedByUs = true
       websocket.close()
     }
   }, [])
@@ -110,6 +126,9 @@ export default function HostPanel({ onGameStateChange }: { onGameStateChange: (s
       case 'host_confirmed':
         console.log('Host confirmed')
         break
+      case 'server_draining':
+        console.log('Server draining, reconnecting...')
+        break
       case 'game_state':
         setGameState(data.state.is_registration_open ? 'registration' : 
                    data.state.is_game_started ? 'playing' : 'waiting')
@@ -42,6 +42,7 @@ export default function PlayerPanel({ gameState, isFromUrl = false }: { gameStat
   const [isCorrect, setIsCorrect] = useState(false)
   const [ws, setWs] = useState<WebSocket | null>(null)
   const [userId, setUserId] = useState<number | null>(null)
+  const playerTokenRef = useRef<string | null>(null)
   const [users, setUsers] = useState<User[]>([])
   const [gameCountdown, setGameCountdown] = useState(0)
   const [localGameState, setLocalGameState] = useState(gameState)
@@ -61,17 +62,37 @@ export default function PlayerPanel({ gameState, isFromUrl = false }: { gameStat
     setRoomId(roomFromUrl)
 
     // WebSocket connection with room ID
-    const websocket = new WebSocket(`${WS_URL}?room_id=${roomFromUrl}`)
-    websocket.onopen = () => {
-      console.log('Connected to game server')
-    }
-    websocket.onmessage = (event) => {
-      const data = JSON.parse(event.data)
-      handleWebSocketMessage(data)
+    let websocket: WebSocket
+    let closedByUs = false
+    let retryAfterMs = 1000
+    const connect = () => {
+      websocket = new WebSocket(`${WS_URL}?room_id=${roomFromUrl}`)
+      websocket.onopen = () => {
+        console.log('Connected to game server')
+        // Re-bind this connection to the player after a reconnect
+        if (playerTokenRef.current) {
+          websocket.send(JSON.stringify({ type: 'player_connect', token: playerTokenRef.current }))
+        }
+      }
+      websocket.onmessage = (event) => {
+        const data = JSON.parse(event.data)
+        if (data.type === 'server_draining' && data.retry_after_ms) {
+          retryAfterMs = data.retry_after_ms
+        }
+        handleWebSocketMessage(data)
+      }
+      websocket.onclose = (event) => {
+        // 1012: the server is restarting, the room resumes on another worker
+        if (!closedByUs && event.code === 1012) {
+          setTimeout(connect, retryAfterMs)
+        }
+      }
+      setWs(websocket)
     }
-    setWs(websocket)
+    connect()
 
     return () => {
+      closedByUs = true
       websocket.close()
     }
   }, [])
@@ -112,6 +133,12 @@ export default function PlayerPanel({ gameState, isFromUrl = false }: { gameStat
   const handleWebSocketMessage = (data: any) => {
     console.log('Player received WebSocket message:', data)
     switch (data.type) {
+      case 'server_draining':
+        console.log('Server draining, reconnecting...')
+        break
+      case 'player_confirmed':
+        console.log('Connection bound to player', data.user_id)
+        break
       case 'registration_started':
         console.log('Registration started')
         setLocalGameState('registration')
@@ -187,6 +214,10 @@ export default function PlayerPanel({ gameState, isFromUrl = false }: { gameStat
 
       if (response.ok) {
         const user = await response.json()
+        playerTokenRef.current = user.token
+        if (ws && ws.readyState === WebSocket.OPEN) {
+          ws.send(JSON.stringify({ type: 'player_connect', token: user.token }))
+        }
         setUserId(user.id)
         setIsRegistered(true)
       }
@@ -211,6 +242,8 @@ export default function PlayerPanel({ gameState, isFromUrl = false }: { gameStat
       question_id: currentQuestion.id,
       selected_answer: selectedAnswer,
       room_id: roomId,
+      // Same key on retries, so a resent answer is never scored twice
+      idempotency_key: `${userId}-${currentQuestion.id}`,
     }
     
     console.log('Submitting answer:', payload)
@@ -220,6 +253,7 @@ export default function PlayerPanel({ gameState, isFromUrl = false }: { gameStat
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
+          'Authorization': `Bearer ${playerTokenRef.current}`,
         },
         body: JSON.stringify(payload),
       })
@@ -229,6 +263,9 @@ export default function PlayerPanel({ gameState, isFromUrl = false }: { gameStat
         setIsCorrect(result.correct)
         setAnswerSubmitted(true)
         setShowResult(true)
+      } else if (response.status === 409) {
+        // Already answered this question
+        setAnswerSubmitted(true)
       } else {
         const errorText = await response.text()
         console.error('Error response:', response.status, errorText)
@@ -0,0 +1,71 @@
+'use client'
+
+import { useState, useEffect, useRef } from 'react'
+import GameBoard from '../components/GameBoard'
+import Leaderboard from '../components/Leaderboard'
+
+// Big-screen / audience view: read-only spectator feed, no game controls
+export default function DisplayPage() {
+  const [currentQuestion, setCurrentQuestion] = useState<any>(null)
+  const [questionTimer, setQuestionTimer] = useState(0)
+  const [users, setUsers] = useState<any[]>([])
+  const [state, setState] = useState<any>(null)
+  const lastQuestionId = useRef<number | null>(null)
+
+  const API_BASE = (typeof window !== 'undefined' && (window as any).__API_URL__) || (process && process.env && process.env.NEXT_PUBLIC_API_URL) || 'http://localhost:8000'
+  // Point this at the spectator relay to keep viewers off the game servers
+  const SPECTATOR_WS_URL = (typeof window !== 'undefined' && (window as any).__SPECTATOR_WS_URL__) || (process && process.env && process.env.NEXT_PUBLIC_SPECTATOR_WS_URL) || API_BASE.replace(/^http/i, 'ws') + '/ws/spectate'
+
+  useEffect(() => {
+    const urlParams = new URLSearchParams(window.location.search)
+    const roomId = urlParams.get('room') || 'default'
+
+    let websocket: WebSocket
+    let closedByUs = false
+    const connect = () => {
+      websocket = new WebSocket(`${SPECTATOR_WS_URL}?room_id=${roomId}`)
+      websocket.onmessage = (event) => {
+        const data = JSON.parse(event.data)
+        if (data.type !== 'spectator_frame') return
+        setState(data.state)
+        setUsers(data.leaderboard || [])
+        setCurrentQuestion(data.question)
+        // Frames repeat the current question; only restart the timer when it changes
+        const questionId = data.question ? data.question.id : null
+        if (questionId !== lastQuestionId.current) {
+          lastQuestionId.current = questionId
+          setQuestionTimer(questionId ? data.state.question_timer : 0)
+        }
+      }
+      websocket.onclose = () => {
+        if (!closedByUs) {
+          setTimeout(connect, 1000)
+        }
+      }
+    }
+    connect()
+
+    return () => {
+      closedByUs = true
+      websocket.close()
+    }
+  }, [])
+
+  return (
+    <main className="min-h-screen bg-gradient-to-br from-slate-900 via-purple-900 to-slate-900">
+      <div className="container mx-auto px-4 py-8">
+        {state && state.is_registration_open && (
+          <h2 className="text-4xl font-bold text-yellow-400 text-center mb-8">
+            ¡REGISTRO ABIERTO!
+          </h2>
+        )}
+        {currentQuestion && (
+          <GameBoard currentQuestion={currentQuestion} questionTimer={questionTimer} isPlayer={false} />
+        )}
+        <div className="mt-8">
+          <Leaderboard users={users} />
+        </div>
+      </div>
+    </main>
+  )
+}